@@ -4,44 +4,106 @@ Core builder interfaces.
 """
 import logging
 import itertools
+import collections
 import copy
+import math
 
 import daft
-from toposort import toposort
 
 from daft_builder import utils
 
 DEFAULT_VERTICAL_OFFSET = 1
 DEFAULT_HORIZONTAL_OFFSET = 0.8
 
+# placement -> (horizontal offset multiplier, vertical offset multiplier, x nudge, y nudge)
+_PLACEMENT_OFFSETS = {
+    'above': (0, 1, 0, 0), 'above_l': (0, 1, -0.3, 0), 'above_r': (0, 1, 0.3, 0),
+    'below': (0, -1, 0, 0), 'below_l': (0, -1, -0.3, 0), 'below_r': (0, -1, 0.3, 0),
+    'left_of': (-1, 0, 0, 0), 'left_of_a': (-1, 0, 0, 0.3), 'left_of_b': (-1, 0, 0, -0.3),
+    'right_of': (1, 0, 0, 0), 'right_of_a': (1, 0, 0, 0.3), 'right_of_b': (1, 0, 0, -0.3),
+}
+
 logger = logging.getLogger(__name__)
 
 
+def _shallow_copy(obj):
+    """Copy every slot in `obj`'s class hierarchy, plus its `__dict__`, into a new instance."""
+    cls = obj.__class__
+    new = object.__new__(cls)
+    if hasattr(obj, '__dict__'):
+        new.__dict__.update(obj.__dict__)
+    for klass in cls.__mro__:
+        slots = klass.__dict__.get('__slots__', ())
+        if isinstance(slots, str):
+            slots = (slots,)
+        for attr in slots:
+            if attr in ('__dict__', '__weakref__'):
+                continue
+            if attr.startswith('__') and not attr.endswith('__'):  # name-mangled slot
+                attr = f"_{klass.__name__.lstrip('_')}{attr}"
+            if hasattr(obj, attr):
+                setattr(new, attr, getattr(obj, attr))
+    return new
+
+
 class _PGM(daft.PGM):
-    """Patched daft PGM class with useful methods for adding batches of edges and nodes."""
+    """Patched daft PGM class with useful methods for adding batches of edges and nodes.
+
+    The batch methods write straight into daft's internal `_nodes`, `_plates` and `_edges`
+    containers when they exist, and fall back to the public per-item methods otherwise.
+    """
 
     def add_nodes(self, nodes):
-        for node in nodes:
-            self.add_node(node)
+        if not hasattr(self, '_nodes'):
+            add_node = self.add_node
+            for node in nodes:
+                add_node(node)
+            return
+
+        self._nodes.update((node.name, node) for node in nodes)
 
     def add_plates(self, plates):
-        for plate in plates:
-            self.add_plate(plate)
+        if not hasattr(self, '_plates'):
+            add_plate = self.add_plate
+            for plate in plates:
+                add_plate(plate)
+            return
+
+        self._plates.extend(plates)
 
     def add_edges(self, names):
-        for from_name, to_name in names:
-            logger.debug(f"adding edge from {from_name} to {to_name}")
-            self.add_edge(from_name, to_name)
+        if not (hasattr(self, '_edges') and hasattr(self, '_nodes') and hasattr(self, '_ctx')):
+            add_edge = self.add_edge
+            for from_name, to_name in names:
+                logger.debug('adding edge from %s to %s', from_name, to_name)
+                add_edge(from_name, to_name)
+            return
+
+        if logger.isEnabledFor(logging.DEBUG):
+            names = list(names)
+            for from_name, to_name in names:
+                logger.debug('adding edge from %s to %s', from_name, to_name)
+
+        nodes = self._nodes
+        directed = self._ctx.directed
+        self._edges.extend([daft.Edge(nodes[from_name], nodes[to_name], directed=directed)
+                            for from_name, to_name in names])
 
 
 class Node:
     """Helper class to build `daft.Node` objects with edges to other nodes."""
 
+    __slots__ = ('x', 'y', 'placement', 'anchor_node', 'shift_x', 'shift_y',
+                 'kwargs', 'symbol', 'name', 'edges_to', 'plate')
+
     _placement_kwargs = ('xy',
                          'above', 'above_l', 'above_r',
                          'below', 'below_l', 'below_r',
                          'left_of', 'left_of_a', 'left_of_b',
                          'right_of', 'right_of_a', 'right_of_b')
+    _placement_kwarg_set = frozenset(_placement_kwargs)
+    # defaults for the kwargs passed through to `daft.Node`; subclasses extend these
+    _kwarg_defaults = {'scale': 2}
 
     def __init__(self, symbol, **kwargs):
         """
@@ -78,6 +140,9 @@ class Node:
         self.shift_x = kwargs.pop('shift_x', 0)
         self.shift_y = kwargs.pop('shift_y', 0)
         self.set_placement(kwargs)
+        # Coordinates only ever come from placement; `build` passes them to daft itself.
+        kwargs.pop('x', None)
+        kwargs.pop('y', None)
 
         self.kwargs = self.add_kwarg_defaults(symbol, kwargs)
         self.symbol = symbol
@@ -93,14 +158,19 @@ class Node:
         return self.__repr__()
 
     def __eq__(self, other):
-        if other is None or not hasattr(other, 'name'):
-            return False
-
-        return self.name == other.name
+        return isinstance(other, Node) and self.name == other.name
 
     def __hash__(self):
+        # Not stored on the node: str hashes are randomized per process, so a stored hash
+        # would be wrong after unpickling elsewhere. The str caches its own hash anyway.
         return hash(self.name)
 
+    def __copy__(self):
+        new = _shallow_copy(self)
+        new.kwargs = self.kwargs.copy()
+        new.edges_to = list(self.edges_to)
+        return new
+
     def in_same_plate(self, other):
         """Compare containing plates of Node builders.
 
@@ -110,29 +180,24 @@ class Node:
         Returns:
             True if the nodes are in the same plate, else False.
         """
-        if self.plate is None:
-            return False
-        if other.plate is None:
-            return False
-
-        return self.plate == other.plate
+        return self.plate is not None and self.plate is other.plate
 
     def set_placement(self, kwargs):
-        placement_kwargs = {name: kwargs.pop(name) for name in self._placement_kwargs
-                            if name in kwargs}
-        num_placements_given = len(placement_kwargs)
+        given = self._placement_kwarg_set.intersection(kwargs)
+        num_placements_given = len(given)
         if num_placements_given != 1:
             raise ValueError(f'{self.__class__.__name__}__init__ can handle at most one of the '
                              f'placement kwargs ({self._placement_kwargs}) '
                              f'but was given {num_placements_given}')
 
-        if 'xy' in placement_kwargs:
-            self.x, self.y = placement_kwargs['xy']
+        placement, = given
+        if placement == 'xy':
+            self.x, self.y = kwargs.pop('xy')
         else:
-            self.placement, self.anchor_node = next(iter(placement_kwargs.items()))
+            self.placement, self.anchor_node = placement, kwargs.pop(placement)
 
     def add_kwarg_defaults(self, symbol, kwargs):
-        kwargs = kwargs.copy()
+        kwargs = {**self._kwarg_defaults, **kwargs}
 
         kwargs['content'] = symbol
         name = kwargs.get('name')
@@ -140,29 +205,33 @@ class Node:
             name = utils.name_from_symbol(symbol)
             kwargs['name'] = name
 
-        kwargs.setdefault('scale', 2)
         if 'fixed' in kwargs and 'offset' not in kwargs:
             kwargs['offset'] = (0, -25) if self.placement.startswith('below') else (0, 10)
 
         return kwargs
 
     def with_edges_to(self, *names):
-        self.edges_to += names
+        """Add edges from this node to other nodes, given by name or as node builders."""
+        self.edges_to += [_node_name(n) for n in names]
         return self
 
     def build(self):
-        kwargs = self.kwargs.copy()
-        kwargs['x'], kwargs['y'] = self.x, self.y
-        return daft.Node(**kwargs)
+        # Unpacking into the call already gives daft its own dict, so no copy is needed.
+        return daft.Node(x=self.x, y=self.y, **self.kwargs)
+
+
+def _node_name(node):
+    return node.name if isinstance(node, Node) else node
 
 
 class Data(Node):
-    def __init__(self, symbol, **kwargs):
-        kwargs.setdefault('observed', True)
-        super().__init__(symbol, **kwargs)
+    __slots__ = ()
+    _kwarg_defaults = {**Node._kwarg_defaults, 'observed': True}
 
 
 class Param(Node):
+    __slots__ = ()
+
     def __init__(self, symbol, of=None, **kwargs):
         super().__init__(symbol, **kwargs)
         if of is None:
@@ -170,22 +239,24 @@ class Param(Node):
                 raise ValueError(f"Param {self.name} must specify node it's a parameter of via "
                                  f"the `of` kwarg or a relative placement kwarg")
             self.edges_to += [self.anchor_node]
-        elif isinstance(of, (str, int, float)):
-            self.edges_to += [of]
+        elif isinstance(of, (str, int, float, Node)):
+            self.edges_to += [_node_name(of)]
         elif hasattr(of, '__iter__'):
-            self.edges_to += list(of)
+            self.edges_to += [_node_name(n) for n in of]
         else:
             raise ValueError(f"unrecognized type for argument 'of': {of} ({type(of)})")
 
 
 class HyperParam(Param):
-    def __init__(self, symbol, of=None, **kwargs):
-        kwargs.setdefault('fixed', True)
-        super().__init__(symbol, of, **kwargs)
+    __slots__ = ()
+    _kwarg_defaults = {**Param._kwarg_defaults, 'fixed': True}
 
 
 class Text(Node):
     """Convenience class for a node being used to place text in a PGM."""
+
+    __slots__ = ()
+
     def __init__(self, text, name=None, **kwargs):
         kwargs['plot_params'] = {**kwargs.get('plot_params', {}), **{'ec': 'none'}}
         super().__init__(text, name=name, **kwargs)
@@ -194,6 +265,9 @@ class Text(Node):
 class Plate:
     """Helper class to build `daft.Plate` objects with nodes inside them."""
 
+    __slots__ = ('label', 'kwargs', '_nodes', 'x', 'y', 'width', 'height', '_rect_cache',
+                 '_node_set')
+
     def __init__(self, label, **kwargs):
         self.label = label
         kwargs['label'] = self.label
@@ -210,14 +284,43 @@ class Plate:
         self.width = None
         self.height = None
 
+        # (node coords, rect) from the last call to `place`
+        self._rect_cache = None
+        # frozenset of `nodes`, see `node_set`
+        self._node_set = None
+
     def __repr__(self):
         return f"{self.__class__.__name__}({self.kwargs['label']}, **{self.kwargs})"
 
     def __str__(self):
         return self.__repr__()
 
-    def __eq__(self, other):
-        return self.kwargs['label'] == other.kwargs['label']
+    def __copy__(self):
+        new = _shallow_copy(self)
+        new.kwargs = self.kwargs.copy()
+        new.nodes = list(self.nodes)
+        return new
+
+    @property
+    def nodes(self):
+        return self._nodes
+
+    @nodes.setter
+    def nodes(self, nodes):
+        # Reassigning the list (as `PGM.fill_nodes_refd_by_name` does) drops the cached set.
+        self._nodes = nodes
+        self._node_set = None
+
+    @property
+    def node_set(self):
+        """The plate's nodes as a frozenset, kept until nodes are added or it is refrozen."""
+        if self._node_set is None:
+            self._node_set = frozenset(self.nodes)
+        return self._node_set
+
+    def freeze_node_set(self):
+        """Recompute `node_set`, e.g. after `nodes` has been changed in place."""
+        self._node_set = frozenset(self.nodes)
 
     @property
     def rect(self):
@@ -234,22 +337,25 @@ class Plate:
         self.x, self.y, self.width, self.height = rect
 
     def place(self):
-        self.rect = utils.bound_nodes_with_rect(*self.nodes)
+        coords = tuple((n.x, n.y) for n in self.nodes)
+        if self._rect_cache is None or self._rect_cache[0] != coords:
+            self._rect_cache = (coords, utils.bound_nodes_with_rect(*self.nodes))
+        self.rect = self._rect_cache[1]
 
     def deconflict_placement(self, other):
         logger.debug('Detected overlapping plates: %s, %s', self.label, other.label)
         if self.same_nodes_as(other):  # complete overlap
-            logger.debug(f'Plate {self.label} has same nodes as other {other.label}')
+            logger.debug('Plate %s has same nodes as other %s', self.label, other.label)
             other.surround(self)
         elif self.contains_nodes_of(other):  # superset
-            logger.debug(f'Plate {self.label} contains nodes of other {other.label}')
+            logger.debug('Plate %s contains nodes of other %s', self.label, other.label)
             self.surround(other)
         elif other.contains_nodes_of(self):  # subset
-            logger.debug(f'Plate {other.label} contains nodes of other {self.label}')
+            logger.debug('Plate %s contains nodes of other %s', other.label, self.label)
             other.surround(self)
         else:  # both plates have nodes the other doesn't
-            logger.debug(f"Both plates have nodes the other doesn't: "
-                         f"{self.label}, {other.label}")
+            logger.debug("Both plates have nodes the other doesn't: %s, %s",
+                         self.label, other.label)
             # shift other out of the way
             other.y -= 0.2
             other.height += 0.2
@@ -258,26 +364,26 @@ class Plate:
     def surround(self, other, amount=0.15):
         x = y = width = height = 0  # offsets
 
-        shares_left = round(self.x, 2) == round(other.x, 2)
+        shares_left = _same_edge(self.x, other.x)
         if shares_left:
             logger.debug('shares left')
             x = -amount
             width = amount
 
-        shares_right = round(self.x + self.width, 2) == round(other.x + other.width, 2)
+        shares_right = _same_edge(self.x + self.width, other.x + other.width)
         if shares_right:
             logger.debug('shares right')
             y = -amount
             width += amount
             height = 2 * amount
 
-        shares_bottom = round(self.y, 2) == round(other.y, 2)
+        shares_bottom = _same_edge(self.y, other.y)
         if shares_bottom:
             logger.debug('shares bottom')
             y = -amount
             height = amount
 
-        shares_top = round(self.y + self.height, 2) == round(other.y + other.height, 2)
+        shares_top = _same_edge(self.y + self.height, other.y + other.height)
         if shares_top:
             logger.debug('shares top')
             height += amount
@@ -286,19 +392,15 @@ class Plate:
                      self.width + width, self.height + height)
 
     def shares_nodes_with(self, other):
-        if not hasattr(other, 'nodes'):
-            raise ValueError("can't compare nodes to object without 'nodes' attribute.")
-
-        return bool(set(self.nodes).intersection(set(other.nodes)))
+        # isdisjoint stops at the first shared node and takes any iterable, so there's no
+        # need to build a set for objects that aren't plates.
+        return not self.node_set.isdisjoint(_nodes_of(other))
 
     def same_nodes_as(self, other):
-        return set(self.nodes) == set(other.nodes)
+        return self.node_set == frozenset(_nodes_of(other))
 
     def contains_nodes_of(self, other):
-        if not hasattr(other, 'nodes'):
-            raise ValueError("can't compare nodes to object without 'nodes' attribute.")
-
-        return set(self.nodes).issuperset(set(other.nodes))
+        return self.node_set.issuperset(_nodes_of(other))
 
     def with_nodes(self, *node_builders):
         for node in node_builders:
@@ -308,6 +410,7 @@ class Plate:
                 node.plate = self
 
         self.nodes += node_builders
+        self._rect_cache = None
         return self
 
     def build(self):
@@ -320,9 +423,40 @@ class Plate:
         return daft.Plate(self.rect, **self.kwargs)
 
 
+def _same_edge(a, b):
+    """Whether two plate edge coordinates coincide, allowing for float noise."""
+    # The edges used to be compared as round(v, 2), i.e. on a 0.01 grid. Half a grid step
+    # keeps coordinates a full hundredth apart distinct, while values that only differ by
+    # float noise no longer fall on opposite sides of a rounding boundary.
+    return math.isclose(a, b, abs_tol=0.005)
+
+
+def _nodes_of(other):
+    """Nodes of another Plate (as its cached set) or of any object with a `nodes` iterable."""
+    if isinstance(other, Plate):
+        return other.node_set
+
+    try:
+        return other.nodes
+    except AttributeError:
+        raise ValueError("can't compare nodes to object without 'nodes' attribute.") from None
+
+
+def _builders_by_name(builders):
+    """Key node builders by name, first one wins; entries that are still just names are skipped."""
+    mapping = {}
+    for node in builders:
+        if not isinstance(node, str):
+            mapping.setdefault(node.name, node)
+    return mapping
+
+
 class PGM:
     """Helper class to build PGMs from the bottom-up."""
 
+    __slots__ = ('kwargs', 'nodes', 'plates', 'vertical_offset', 'horizontal_offset',
+                 '_placement_cache')
+
     def __init__(self, *, vertical_offset=None, horizontal_offset=None, **kwargs):
         kwargs.setdefault('origin', (0, 0))
         kwargs.setdefault('grid_unit', 4)
@@ -338,17 +472,22 @@ class PGM:
         self.horizontal_offset = \
             DEFAULT_HORIZONTAL_OFFSET if horizontal_offset is None else horizontal_offset
 
+        # (key, [(name, x, y)]) from the last call to `place_nodes`
+        self._placement_cache = None
+
     def with_plate(self, plate_builder):
         self.plates.append(plate_builder)
+        self._placement_cache = None
         return self
 
     def with_nodes(self, *node_builders):
         self.nodes += node_builders
+        self._placement_cache = None
         return self
 
     def get_node(self, name):
-        for node in self.nodes:
-            if node.name == name:
+        for node in itertools.chain(self.nodes, self.plate_node_builders):
+            if not isinstance(node, str) and node.name == name:
                 return node
 
         raise KeyError(f"No node with name {name}")
@@ -360,58 +499,124 @@ class PGM:
 
     @property
     def all_node_builders(self):
-        return self.nodes + list(self.plate_node_builders)
+        return self.nodes + [node for plate in self.plates for node in plate.nodes]
 
     def build(self):
         # First fill in any node builders that are referenced by name in the plates
         self.fill_nodes_refd_by_name()
+        # Collect the node builders once; everything below works from this list.
+        builders = self.all_node_builders
 
         # Handle placement of all nodes before building anything.
-        self.place_nodes()
+        self.place_nodes(builders)
 
         # Next place all plates
         self.place_plates()
 
         if 'shape' not in self.kwargs:
-            self.kwargs['shape'] = self.place()
+            self.kwargs['shape'] = self.place(builders)
 
         pgm = _PGM(**self.kwargs)
 
         # Build plates and nodes.
         plates = [builder.build() for builder in self.plates]
-        nodes = [builder.build() for builder in self.all_node_builders]
+        nodes = [builder.build() for builder in builders]
 
         # Finally, add all plates, nodes, and edges to PGM
         pgm.add_plates(plates)
         pgm.add_nodes(nodes)
-        pgm.add_edges(self.get_edge_pairs())
+        pgm.add_edges(self.get_edge_pairs(builders))
 
         return pgm
 
     def copy(self):
-        return copy.deepcopy(self)
+        """Copy this builder along with its plate and node builders.
+
+        The builders' own kwargs dicts and node/edge lists are copied, but values inside the
+        kwargs (e.g. `plot_params` or `bbox` dicts) are shared with the original.
+        """
+        plates = {id(plate): copy.copy(plate) for plate in self.plates}
+        nodes = {}
+
+        def copy_node(node):
+            if isinstance(node, str):
+                return node
+            if id(node) not in nodes:
+                new_node = nodes[id(node)] = copy.copy(node)
+                if node.plate is not None:
+                    new_node.plate = plates.get(id(node.plate), node.plate)
+            return nodes[id(node)]
+
+        new = _shallow_copy(self)
+        new.kwargs = self.kwargs.copy()
+        new.nodes = [copy_node(n) for n in self.nodes]
+        new.plates = list(plates.values())
+        for plate in new.plates:
+            plate.nodes = [copy_node(n) for n in plate.nodes]
+        return new
 
     def fill_nodes_refd_by_name(self):
         """Sub in actual node daft_builder anywhere node was referenced by name in any plates."""
-        node_mapping = {n.name: n for n in self.all_node_builders if not isinstance(n, str)}
+        node_mapping = None
         for plate in self.plates:
+            if not any(isinstance(n, str) for n in plate.nodes):
+                continue
+
+            if node_mapping is None:
+                node_mapping = _builders_by_name(self.all_node_builders)
             plate.nodes = [node_mapping[n] if isinstance(n, str) else n for n in plate.nodes]
 
-    def place_nodes(self):
-        # Build dep graph
-        builders = self.all_node_builders
-        dep_graph = {n.name: set() if n.anchor_node is None else {n.anchor_node}
-                     for n in builders}
-        name_batches = toposort(dep_graph)
-        builder_map = {n.name: n for n in builders}
-
-        # Place nodes in each batch
-        for names in name_batches:
-            for name in names:
+    def placement_key(self, builders):
+        """Fingerprint everything that determines the placement of the given node builders."""
+        return (self.vertical_offset, self.horizontal_offset) + tuple(
+            (n.name, n.anchor_node, n.placement, n.shift_x, n.shift_y,
+             (n.x, n.y) if n.anchor_node is None else None,
+             n.plate)  # plates compare by identity, like `in_same_plate`
+            for n in builders)
+
+    def place_nodes(self, builders=None):
+        if builders is None:
+            builders = self.all_node_builders
+        # Nothing to place if every node was given explicit coordinates.
+        if all(n.anchor_node is None for n in builders):
+            return
+
+        builder_map = _builders_by_name(builders)
+
+        # Replay the last placement if nothing that affects it has changed.
+        key = self.placement_key(builders)
+        if self._placement_cache is not None and self._placement_cache[0] == key:
+            for name, x, y in self._placement_cache[1]:
                 builder = builder_map[name]
-                if builder.anchor_node is not None:
-                    anchor = builder_map[builder.anchor_node]
-                    builder.x, builder.y = self.place_node(builder, anchor)
+                builder.x, builder.y = x, y
+            return
+
+        # Kahn's algorithm: every node has at most one incoming edge (from its anchor), so
+        # walk outward from the explicitly placed nodes, placing each node once its anchor is.
+        dependents = collections.defaultdict(list)
+        queue = collections.deque()
+        for builder in builder_map.values():
+            if builder.anchor_node is None:
+                queue.append(builder)
+            else:
+                dependents[builder.anchor_node].append(builder)
+
+        placed = []
+        while queue:
+            anchor = queue.popleft()
+            for builder in dependents.pop(anchor.name, ()):
+                builder.x, builder.y = self.place_node(builder, anchor)
+                placed.append((builder.name, builder.x, builder.y))
+                queue.append(builder)
+
+        if dependents:
+            missing = dependents.keys() - builder_map.keys()
+            if missing:
+                raise KeyError(f"No node with name {missing.pop()}")
+            unplaced = {n.name for builders in dependents.values() for n in builders}
+            raise ValueError(f'circular dependencies exist among these nodes: {unplaced}')
+
+        self._placement_cache = (key, placed)
 
     def place_node(self, builder, anchor):
         """Get x, y coords for a particular node relative to its anchor node.
@@ -423,55 +628,63 @@ class PGM:
         Returns:
              tuple: x, y coords for the node's placement.
         """
-        anchor_x, anchor_y = anchor.x, anchor.y
-
-        if builder.placement.startswith('above'):
-            x, y = (anchor_x, anchor_y + self.vertical_offset)
-        elif builder.placement.startswith('below'):
-            x, y = (anchor_x, anchor_y - self.vertical_offset)
-        elif builder.placement.startswith('left_of'):
-            x, y = (anchor_x - self.horizontal_offset, anchor_y)
-            # Adjust for plate around anchor, if present
-            if anchor.plate and not anchor.in_same_plate(builder):
-                x -= 0.1
-        else:  # right_of
-            x, y = (anchor_x + self.horizontal_offset, anchor_y)
-            # Adjust for plate around anchor, if present
-            if anchor.plate and not anchor.in_same_plate(builder):
-                x += 0.1
+        h, v, nudge_x, nudge_y = _PLACEMENT_OFFSETS[builder.placement]
+        x = anchor.x + h * self.horizontal_offset
+        y = anchor.y + v * self.vertical_offset
+
+        # Adjust for plate around anchor, if present
+        if h and anchor.plate and not anchor.in_same_plate(builder):
+            x += h * 0.1
 
         # Do shifting if specified
-        if builder.placement.endswith('_l'):
-            x -= 0.3
-        elif builder.placement.endswith('_r'):
-            x += 0.3
-        elif builder.placement.endswith('_a'):
-            y += 0.3
-        elif builder.placement.endswith('_b'):
-            y -= 0.3
+        x += nudge_x
+        y += nudge_y
 
         return x + builder.shift_x, y + builder.shift_y
 
     def place_plates(self):
-        for plate in self.plates:
-            plate.place()
+        # Place and index the plates in one pass, then reposition any overlapping ones.
+        self.deconflict_plate_placement(self.index_plates_by_node(place=True))
+
+    def index_plates_by_node(self, place=False):
+        """Map each node to the indices of the plates that contain it, in plate order.
 
-        # Need to reposition any overlapping plates.
-        self.deconflict_plate_placement()
+        Args:
+            place (bool): also place each plate as it is indexed.
+
+        Returns:
+            dict: node builder -> list of indices into `self.plates`.
+        """
+        plates_by_node = collections.defaultdict(list)
+        for i, plate in enumerate(self.plates):
+            if place:
+                plate.place()
+            plate.freeze_node_set()
+            for node in plate.node_set:
+                plates_by_node[node].append(i)
 
-    def deconflict_plate_placement(self):
+        return plates_by_node
+
+    def deconflict_plate_placement(self, plates_by_node=None):
         # We'll figure this out by looking at the nodes inside them.
         # We could look at the corners, but some plates may be exactly in the middle of others,
         # and the corners method would fail to find those.
-        all_plates = self.plates[::-1]
-        while all_plates:
-            plate = all_plates.pop()
-            for other in all_plates:
-                if plate.shares_nodes_with(other):
-                    plate.deconflict_placement(other)
-
-    def place(self):
-        x, y, width, height = utils.bound_nodes_with_rect(*self.all_node_builders)
+        # Only plates that actually share nodes get compared.
+        if plates_by_node is None:
+            plates_by_node = self.index_plates_by_node()
+
+        overlapping = set()
+        for indices in plates_by_node.values():
+            overlapping.update(itertools.combinations(indices, 2))
+
+        # Deconflict in the same order as comparing each plate to those after it, last first.
+        for i, j in sorted(overlapping, key=lambda pair: (pair[0], -pair[1])):
+            self.plates[i].deconflict_placement(self.plates[j])
+
+    def place(self, builders=None):
+        if builders is None:
+            builders = self.all_node_builders
+        x, y, width, height = utils.bound_nodes_with_rect(*builders)
         x_units = x + width
         y_units = y + height
 
@@ -484,8 +697,10 @@ class PGM:
 
         return x_units, y_units
 
-    def get_edge_pairs(self):
-        for node_builder in self.all_node_builders:
-            for to_node_name in node_builder.edges_to:
-                yield (node_builder.name, to_node_name)
+    def get_edge_pairs(self, builders=None):
+        if builders is None:
+            builders = self.all_node_builders
+        return [(node_builder.name, to_node_name)
+                for node_builder in builders
+                for to_node_name in node_builder.edges_to]
 
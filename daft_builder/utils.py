@@ -2,40 +2,70 @@
 Utility functions.
 
 """
+import functools
+import re
 
 
+_SYMBOL_RE = re.compile(r"""
+    (?:\\(?P<modifier>[A-Za-z]+)\{                          # e.g. \tilde{X}
+        (?P<modified>[^_^{}]*)                             # e.g. X, \beta
+        (?:_(?:\{(?P<modified_braced_sub>[^}]*)\}          # e.g. \tilde{X_{i, j}}
+             |(?P<modified_sub>[^^{}]*)))?                 # e.g. \bar{x_i}
+    \})?
+    (?P<base>[^_^]*)                                       # e.g. X, \sigma
+    (?:_(?:\{(?P<braced_sub>[^}]*)\}(?P<rest>[^^]*)        # e.g. _{i, j}
+         |(?P<sub>[^^]*)))?                                # e.g. _c
+    (?:\^(?P<exp>.*))?                                     # e.g. ^2
+    """, re.VERBOSE)
+_SUBSCRIPT_SEPARATORS = str.maketrans('', '', ', ')
+
+
+@functools.lru_cache(maxsize=None)
 def name_from_symbol(symbol):
-    starts_with_modifier = symbol.startswith('$\\')
-    symbol = symbol.strip('$').replace('\\', '')
-
-    if starts_with_modifier and '{' in symbol:   # e.g. \tilde{X}
-        start = symbol.index('{')
-        end = symbol.index('}')
-        without_modifier = symbol[start + 1: end] + symbol[end + 1:]
-        modifier = symbol[:start]
-        base, extras = without_modifier.split('_', 1)
-        symbol = '_'.join([base, modifier, extras])
-
-    if '_{' in symbol:  # e.g. X_{i, j}
-        without_sub, rest = symbol.split('_{', 1)
-        subscript, rest = rest.split('}', 1)
-        subscript = subscript.replace(',', '').replace(' ', '')
-        symbol = '_'.join([without_sub, subscript]) + rest
-
-    if '^' in symbol:  # e.g. \sigma_c^2
-        base, exp = symbol.split('^')
-        if exp != '2':
+    m = _SYMBOL_RE.fullmatch(symbol.strip('$'))
+    if m is None:
+        raise ValueError(f'unable to derive a node name from symbol {symbol!r}')
+
+    parts = [(m['modified'] or '') + m['base']]
+    if m['modifier'] is not None:
+        parts.append(m['modifier'])
+
+    # A subscript inside the modifier's braces comes first, e.g. \bar{x_i} -> x_bar_i
+    if m['modified_braced_sub'] is not None:
+        parts.append(m['modified_braced_sub'].translate(_SUBSCRIPT_SEPARATORS))
+    elif m['modified_sub'] is not None:
+        parts.append(m['modified_sub'])
+
+    if m['braced_sub'] is not None:
+        parts.append(m['braced_sub'].translate(_SUBSCRIPT_SEPARATORS) + m['rest'])
+    elif m['sub'] is not None:
+        parts.append(m['sub'])
+
+    if m['exp'] is not None:
+        if m['exp'] != '2':
             raise ValueError('unable to handle names with exponents not equal to 2')
-        symbol = base + '_' + 'sq'
+        parts.append('sq')
 
-    return symbol
+    return '_'.join(parts).replace('\\', '')
 
 
 def node_bounds(*nodes):
     """Get the min and max for the x- and y-coordinates for an iterable of `daft.Node`s."""
-    xs = list(n.x for n in nodes)
-    ys = list(n.y for n in nodes)
-    return (min(xs), max(xs)), (min(ys), max(ys))
+    it = iter(nodes)
+    first = next(it)
+    min_x = max_x = first.x
+    min_y = max_y = first.y
+    for n in it:
+        x, y = n.x, n.y
+        if x < min_x:
+            min_x = x
+        elif x > max_x:
+            max_x = x
+        if y < min_y:
+            min_y = y
+        elif y > max_y:
+            max_y = y
+    return (min_x, max_x), (min_y, max_y)
 
 
 def bound_nodes_with_rect(*nodes):
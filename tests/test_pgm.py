@@ -1,4 +1,7 @@
 import matplotlib; matplotlib.use('Agg')
+import collections
+import logging
+
 from daft_builder import pgm
 
 import pytest
@@ -38,3 +41,401 @@ def test_Text_init():
     t = pgm.Text("some text", "t", xy=(1, 1))
     assert t.name == "t"
     assert t.kwargs['plot_params'] == {"ec": "none"}
+
+
+def _count_calls(monkeypatch, owner, name):
+    """Wrap `owner.name` for the rest of the test; returns the list its calls are recorded in."""
+    calls = []
+    original = getattr(owner, name)
+
+    def counting(*args, **kwargs):
+        calls.append(args)
+        return original(*args, **kwargs)
+
+    monkeypatch.setattr(owner, name, counting)
+    return calls
+
+
+@pytest.fixture
+def daft_edges(monkeypatch):
+    """(from, to) node names of every `daft.Edge` created during the test."""
+    edges = []
+
+    class RecordingEdge(pgm.daft.Edge):
+        def __init__(self, node1, node2, **kwargs):
+            super().__init__(node1, node2, **kwargs)
+            edges.append((node1.name, node2.name))
+
+    monkeypatch.setattr(pgm.daft, 'Edge', RecordingEdge)
+    return edges
+
+
+def test_PGM_place_nodes_replays_cached_placement(monkeypatch):
+    x = pgm.Data(r"$x$", xy=(1, 1))
+    y = pgm.Param(r"$y$", above="x")
+    model = pgm.PGM().with_nodes(x, y)
+    calls = _count_calls(monkeypatch, pgm.PGM, 'place_node')
+    model.place_nodes()
+    assert (y.x, y.y) == (1, 2)
+    assert len(calls) == 1
+
+    y.x = y.y = None
+    model.place_nodes()
+    assert (y.x, y.y) == (1, 2)
+    assert len(calls) == 1
+
+    x.x, x.y = 2, 2
+    model.place_nodes()
+    assert (y.x, y.y) == (2, 3)
+    assert len(calls) == 2
+
+
+def test_Plate_place_reuses_rect_until_nodes_move(monkeypatch):
+    x = pgm.Data(r"$x$", xy=(1, 1))
+    plate = pgm.Plate("N").with_nodes(x)
+    calls = _count_calls(monkeypatch, pgm.utils, 'bound_nodes_with_rect')
+    plate.place()
+    rect = plate.rect
+    assert len(calls) == 1
+
+    plate.rect = (0, 0, 0, 0)
+    plate.place()
+    assert plate.rect == rect
+    assert len(calls) == 1
+
+    x.x = 2
+    plate.place()
+    assert plate.rect == (rect[0] + 1,) + rect[1:]
+    assert len(calls) == 2
+
+
+def test_PGM_node_builders_reflect_later_changes():
+    x = pgm.Data(r"$x$", xy=(1, 1))
+    y = pgm.Param(r"$y$", above="x")
+    plate = pgm.Plate("N").with_nodes(x)
+    model = pgm.PGM().with_plate(plate)
+    assert model.all_node_builders == [x]
+
+    plate.with_nodes(y)
+    assert model.all_node_builders == [x, y]
+
+
+def test_PGM_build_adds_nodes_plates_and_edges(daft_edges):
+    x = pgm.Data(r"$x$", xy=(1, 1))
+    y = pgm.Param(r"$y$", above="x")
+    built = pgm.PGM().with_plate(pgm.Plate("N").with_nodes(x)).with_nodes(y).build()
+    assert isinstance(built, pgm.daft.PGM)
+    assert daft_edges == [("y", "x")]
+
+
+def test_Node_build_leaves_kwargs_untouched():
+    x = pgm.Data(r"$x$", xy=(1, 2))
+    kwargs = dict(x.kwargs)
+    node = x.build()
+    assert (node.x, node.y) == (1, 2)
+    assert x.kwargs == kwargs
+
+
+def test_PGM_get_edge_pairs():
+    x = pgm.Data(r"$x$", xy=(1, 1))
+    w = pgm.Data(r"$w$", xy=(2, 1))
+    y = pgm.Param(r"$y$", above="x", of=["x", "w"])
+    model = pgm.PGM().with_nodes(x, w).with_plate(pgm.Plate("N").with_nodes(y))
+    assert model.get_edge_pairs() == [("y", "x"), ("y", "w")]
+
+
+def test_Plate_comparisons_see_nodes_filled_in_by_name():
+    x = pgm.Data(r"$x$", xy=(1, 1))
+    y = pgm.Param(r"$y$", above="x")
+    by_name = pgm.Plate("N").with_nodes("x")
+    by_object = pgm.Plate("M").with_nodes(x, y)
+    model = pgm.PGM().with_nodes(x).with_plate(by_name).with_plate(by_object)
+    assert not by_object.shares_nodes_with(by_name)
+
+    model.fill_nodes_refd_by_name()
+    assert by_object.shares_nodes_with(by_name)
+    assert by_object.contains_nodes_of(by_name)
+    assert not by_name.contains_nodes_of(by_object)
+
+
+def test_PGM_place_nodes_cache_distinguishes_plates_with_same_label():
+    a = pgm.Data(r"$a$", xy=(1, 1))
+    b = pgm.Param(r"$b$", right_of="a")
+    plate_a = pgm.Plate("N").with_nodes(a)
+    plate_b = pgm.Plate("N").with_nodes(b)
+    model = pgm.PGM().with_plate(plate_a).with_nodes(b)
+    model.place_nodes()
+    assert b.x == pytest.approx(1.9)
+
+    plate_a.with_nodes(b)
+    assert plate_b is not plate_a
+    model.place_nodes()
+    assert b.x == pytest.approx(1.8)
+
+
+def test_Node_in_same_plate_compares_plate_identity():
+    x = pgm.Data(r"$x$", xy=(1, 1))
+    y = pgm.Data(r"$y$", xy=(2, 1))
+    z = pgm.Data(r"$z$", xy=(3, 1))
+    assert not x.in_same_plate(y)
+
+    pgm.Plate("N").with_nodes(x, y)
+    pgm.Plate("N").with_nodes(z)
+    assert x.in_same_plate(y)
+    assert not x.in_same_plate(z)
+
+
+@pytest.mark.parametrize("kwargs", [
+    {},
+    {"xy": (1, 1), "above": "x"},
+])
+def test_Node_init_requires_exactly_one_placement(kwargs):
+    with pytest.raises(ValueError):
+        pgm.Node(r"$y$", **kwargs)
+
+
+@pytest.mark.parametrize("placement,expected", [
+    ("above", (1, 2)), ("above_l", (0.7, 2)), ("above_r", (1.3, 2)),
+    ("below", (1, 0)), ("below_l", (0.7, 0)), ("below_r", (1.3, 0)),
+    ("left_of", (0.2, 1)), ("left_of_a", (0.2, 1.3)), ("left_of_b", (0.2, 0.7)),
+    ("right_of", (1.8, 1)), ("right_of_a", (1.8, 1.3)), ("right_of_b", (1.8, 0.7)),
+])
+def test_PGM_place_node(placement, expected):
+    anchor = pgm.Data(r"$x$", xy=(1, 1))
+    builder = pgm.Param(r"$y$", **{placement: "x"})
+    x, y = pgm.PGM().place_node(builder, anchor)
+    assert (x, y) == pytest.approx(expected)
+
+
+def test_PGM_place_node_clears_plate_around_anchor():
+    anchor = pgm.Data(r"$x$", xy=(1, 1))
+    pgm.Plate("N").with_nodes(anchor)
+    model = pgm.PGM()
+    assert model.place_node(pgm.Param(r"$y$", left_of="x"), anchor) == pytest.approx((0.1, 1))
+    assert model.place_node(pgm.Param(r"$y$", right_of="x"), anchor) == pytest.approx((1.9, 1))
+    assert model.place_node(pgm.Param(r"$y$", above="x"), anchor) == pytest.approx((1, 2))
+
+
+def test_PGM_copy_preserves_slotted_builders():
+    x = pgm.Data(r"$x$", xy=(1, 1))
+    y = pgm.Param(r"$y$", above="x")
+    model = pgm.PGM().with_plate(pgm.Plate("N").with_nodes(x, y))
+    copied = model.copy()
+    x_copy, y_copy = copied.plates[0].nodes
+    assert not hasattr(x_copy, '__dict__')
+    assert (x_copy.x, x_copy.y) == (1, 1)
+    assert y_copy.plate is copied.plates[0]
+    assert x_copy.in_same_plate(y_copy)
+
+
+def test_PGM_place_nodes_skips_explicitly_placed_nodes(monkeypatch):
+    x = pgm.Data(r"$x$", xy=(1, 1))
+    w = pgm.Data(r"$w$", xy=(2, 1))
+    model = pgm.PGM().with_nodes(x, w)
+    calls = _count_calls(monkeypatch, pgm.PGM, 'placement_key')
+    model.place_nodes()
+    assert [(n.x, n.y) for n in model.all_node_builders] == [(1, 1), (2, 1)]
+    assert calls == []
+
+
+def test_PGM_place_nodes_follows_anchor_chains():
+    x = pgm.Data(r"$x$", xy=(1, 1))
+    z = pgm.Param(r"$z$", above="y")
+    y = pgm.Param(r"$y$", above="x")
+    model = pgm.PGM().with_nodes(z, y, x)
+    model.place_nodes()
+    assert (y.x, y.y) == (1, 2)
+    assert (z.x, z.y) == (1, 3)
+
+
+def test_PGM_place_nodes_raises_on_missing_anchor():
+    model = pgm.PGM().with_nodes(pgm.Data(r"$x$", xy=(1, 1)), pgm.Param(r"$y$", above="w"))
+    with pytest.raises(KeyError):
+        model.place_nodes()
+
+
+def test_PGM_place_nodes_raises_on_circular_anchors():
+    model = pgm.PGM().with_nodes(pgm.Data(r"$x$", xy=(1, 1)),
+                                 pgm.Param(r"$y$", above="z"),
+                                 pgm.Param(r"$z$", above="y"))
+    with pytest.raises(ValueError):
+        model.place_nodes()
+
+
+def test_PGM_get_node():
+    x = pgm.Data(r"$x$", xy=(1, 1))
+    y = pgm.Param(r"$y$", above="x")
+    model = pgm.PGM().with_nodes(x).with_plate(pgm.Plate("N").with_nodes(y))
+    assert model.get_node("x") is x
+    assert model.get_node("y") is y
+    with pytest.raises(KeyError):
+        model.get_node("w")
+
+    w = pgm.Data(r"$w$", xy=(2, 1))
+    model.nodes.append(w)
+    assert model.get_node("w") is w
+
+
+class _TaggedData(pgm.Data):
+    def __init__(self, symbol, **kwargs):
+        super().__init__(symbol, **kwargs)
+        self.extra = {"tag": symbol}
+
+
+def test_PGM_copy_is_independent_of_original():
+    x = pgm.Data(r"$x$", xy=(1, 1))
+    y = pgm.Param(r"$y$", above="x")
+    t = _TaggedData(r"$t$", right_of="x")
+    model = pgm.PGM().with_nodes(x, t).with_plate(pgm.Plate("N").with_nodes("x", y))
+    copied = model.copy()
+
+    copied.get_node("x").with_edges_to("y")
+    copied.with_nodes(pgm.Data(r"$w$", xy=(2, 1)))
+    copied.build()
+    assert x.edges_to == []
+    assert len(model.nodes) == 2
+    assert copied.get_node("t") is not t
+    assert copied.get_node("t").extra == {"tag": r"$t$"}
+    assert model.plates[0].nodes == ["x", y]
+    assert copied.get_node("y") is not y
+    assert copied.get_node("y").plate is copied.plates[0]
+    assert copied.plates[0].nodes[0] is copied.get_node("x")
+
+
+def test_PGM_fill_nodes_refd_by_name():
+    x = pgm.Data(r"$x$", xy=(1, 1))
+    y = pgm.Param(r"$y$", above="x")
+    by_object = pgm.Plate("N").with_nodes(y)
+    by_name = pgm.Plate("M").with_nodes("x", y)
+    model = pgm.PGM().with_nodes(x).with_plate(by_object).with_plate(by_name)
+    assert "x" in model.all_node_builders
+
+    model.fill_nodes_refd_by_name()
+    assert by_object.nodes == [y]
+    assert by_name.nodes[0] is x
+    assert "x" not in model.all_node_builders
+
+
+def test_PGM_place_plates_deconflicts_overlapping_plates():
+    model = pgm.PGM().with_nodes(pgm.Data(r"$a$", xy=(1, 1)),
+                                 pgm.Data(r"$b$", xy=(2, 1)),
+                                 pgm.Data(r"$c$", xy=(3, 1)),
+                                 pgm.Data(r"$d$", xy=(1, 2)))
+    for label, names in [("A", "ab"), ("B", "abc"), ("C", "bc"),
+                         ("D", "ab"), ("E", "d"), ("F", "cd")]:
+        model.with_plate(pgm.Plate(label).with_nodes(*names))
+
+    model.fill_nodes_refd_by_name()
+    model.place_plates()
+    expected = [(0.6, 0.65, 1.8, 0.85), (0.3, 0.2, 3.25, 1.45), (1.6, 0.45, 1.8, 1.15),
+                (0.45, 0.3, 2.1, 1.25), (0.6, 1.65, 0.8, 0.75), (0.45, 0.25, 2.95, 2.3)]
+    for plate, rect in zip(model.plates, expected):
+        assert plate.rect == pytest.approx(rect)
+
+
+def test_Plate_node_comparisons():
+    a, b, c = (pgm.Data(s, xy=(i, 1)) for i, s in enumerate("abc"))
+    ab = pgm.Plate("AB").with_nodes(a, b)
+    abc = pgm.Plate("ABC").with_nodes(a, b, c)
+    c_only = pgm.Plate("C").with_nodes(c)
+    assert ab.shares_nodes_with(abc)
+    assert not ab.shares_nodes_with(c_only)
+    assert abc.contains_nodes_of(ab)
+    assert not ab.contains_nodes_of(abc)
+    assert not ab.same_nodes_as(abc)
+
+    ab.with_nodes(c)
+    assert ab.same_nodes_as(abc)
+
+
+def test_PGM_index_plates_by_node():
+    a, b = pgm.Data(r"$a$", xy=(1, 1)), pgm.Data(r"$b$", xy=(2, 1))
+    model = (pgm.PGM()
+             .with_plate(pgm.Plate("A").with_nodes(a))
+             .with_plate(pgm.Plate("AB").with_nodes(a, b)))
+    assert model.index_plates_by_node() == {a: [0, 1], b: [1]}
+    assert all(plate.rect is None for plate in model.plates)
+
+    model.index_plates_by_node(place=True)
+    assert all(plate.rect is not None for plate in model.plates)
+
+
+def test_Plate_shares_nodes_with_any_object_with_nodes():
+    a, b = pgm.Data(r"$a$", xy=(1, 1)), pgm.Data(r"$b$", xy=(2, 1))
+    plate = pgm.Plate("A").with_nodes(a)
+    Group = collections.namedtuple('Group', 'nodes')
+    assert plate.shares_nodes_with(Group([b, a]))
+    assert not plate.shares_nodes_with(Group([b]))
+    with pytest.raises(ValueError):
+        plate.shares_nodes_with(a)
+
+
+def test_Node_coordinates_come_from_placement_only():
+    x = pgm.Data(r"$x$", xy=(1, 2), x=5, y=6)
+    assert 'x' not in x.kwargs and 'y' not in x.kwargs
+    node = x.build()
+    assert (node.x, node.y) == (1, 2)
+
+
+def test_PGM_build_logs_edges_at_debug_level(caplog, daft_edges):
+    x = pgm.Data(r"$x$", xy=(1, 1))
+    y = pgm.Param(r"$y$", above="x")
+    with caplog.at_level(logging.DEBUG, logger=pgm.logger.name):
+        pgm.PGM().with_nodes(x, y).build()
+    assert "adding edge from y to x" in [r.getMessage() for r in caplog.records]
+    assert daft_edges == [("y", "x")]
+
+
+def test_Node_eq_compares_names_of_node_builders():
+    x = pgm.Data(r"$x$", xy=(1, 1))
+    assert x == pgm.Param(r"$x$", xy=(2, 2), of="y")
+    assert x != pgm.Data(r"$y$", xy=(1, 1))
+    assert x != "x"
+    assert x != None  # noqa: E711
+
+
+def test_edges_to_node_builders_are_stored_by_name(daft_edges):
+    x = pgm.Data(r"$x$", xy=(1, 1))
+    w = pgm.Data(r"$w$", xy=(2, 1))
+    assert pgm.Param(r"$y$", xy=(1, 2), of=x).edges_to == ["x"]
+    assert pgm.Param(r"$y$", xy=(1, 2), of=[x, "w"]).edges_to == ["x", "w"]
+    assert pgm.Data(r"$z$", xy=(1, 3)).with_edges_to(x, "w").edges_to == ["x", "w"]
+
+    pgm.PGM().with_nodes(x, w, pgm.Param(r"$y$", above="x", of=[x, w])).build()
+    assert daft_edges == [("y", "x"), ("y", "w")]
+
+
+@pytest.mark.parametrize("method", ["shares_nodes_with", "same_nodes_as", "contains_nodes_of"])
+def test_Plate_node_comparisons_require_nodes(method):
+    plate = pgm.Plate("A").with_nodes(pgm.Data(r"$a$", xy=(1, 1)))
+    with pytest.raises(ValueError):
+        getattr(plate, method)(object())
+
+
+def test_Node_kwarg_defaults():
+    data = pgm.Data(r"$x$", xy=(1, 1))
+    assert data.kwargs['scale'] == 2
+    assert data.kwargs['observed'] is True
+    assert 'observed' not in pgm.Param(r"$y$", above="x").kwargs
+    assert pgm.Data(r"$x$", xy=(1, 1), observed=False, scale=1).kwargs['observed'] is False
+
+    hyper = pgm.HyperParam(r"$\alpha$", above="x")
+    assert hyper.kwargs['fixed'] is True
+    assert hyper.kwargs['offset'] == (0, 10)
+    assert hyper.edges_to == ["x"]
+    assert pgm.HyperParam(r"$\alpha$", below="x").kwargs['offset'] == (0, -25)
+
+
+def test_Node_hash_matches_name():
+    x = pgm.Data(r"$x$", xy=(1, 1))
+    assert hash(x) == hash("x")
+    assert hash(pgm.PGM().with_nodes(x).copy().nodes[0]) == hash(x)
+
+
+def test_Plate_surround_ignores_float_noise_in_shared_edges():
+    inner = pgm.Plate("inner")
+    inner.rect = (0.145, 0.5, 1, 1)
+    outer = pgm.Plate("outer")
+    outer.rect = (0.14500000001, 0.2, 2, 2)
+    outer.surround(inner)
+    assert outer.rect == pytest.approx((0.14500000001 - 0.15, 0.2, 2.15, 2))
@@ -1,4 +1,6 @@
 import matplotlib; matplotlib.use('Agg')
+import collections
+
 import pytest
 
 from daft_builder import utils
@@ -12,9 +14,26 @@ from daft_builder import utils
     (r"$\sigma_c", "sigma_c"),
     (r"$\sigma_c^2", "sigma_c_sq"),
     (r"$X_{i, j}", "X_ij"),
+    (r"$\beta_{k}$", "beta_k"),
     (r"$\tilde{X}_i", "X_tilde_i"),
     (r"$\tilde{X}_{i,j}", "X_tilde_ij"),
-    (r"$\tilde{X}_{i,j}^2", "X_tilde_ij_sq")
+    (r"$\tilde{X}_{i,j}^2", "X_tilde_ij_sq"),
+    (r"$\bar{x_i}$", "x_bar_i"),
+    (r"$\hat{\beta_0}$", "beta_hat_0"),
+    (r"$\tilde{X_{i,j}}$", "X_tilde_ij")
 ])
 def test_name_from_symbol(symbol, expected):
     assert utils.name_from_symbol(symbol) == expected
+
+
+@pytest.mark.parametrize('symbol', ["x^3", "x^2\ny", r"$\hat{\sigma^2}$"])
+def test_name_from_symbol_raises_on_unhandled_symbols(symbol):
+    with pytest.raises(ValueError):
+        utils.name_from_symbol(symbol)
+
+
+def test_node_bounds():
+    Point = collections.namedtuple('Point', 'x y')
+    points = [Point(1, 2), Point(-1, 3), Point(0.5, -2), Point(4, 0)]
+    assert utils.node_bounds(*points) == ((-1, 4), (-2, 3))
+    assert utils.node_bounds(Point(1, 2)) == ((1, 1), (2, 2))